@@ -0,0 +1,18 @@
+import importlib.util
+from importlib.machinery import SourceFileLoader
+from pathlib import Path
+
+import pytest
+
+BOT_PATH = Path(__file__).resolve().parent.parent / "Test11"
+
+
+@pytest.fixture(scope="session")
+def bot():
+    pytest.importorskip("aiosqlite")
+    pytest.importorskip("telegram")
+    loader = SourceFileLoader("bot_under_test", str(BOT_PATH))
+    spec = importlib.util.spec_from_loader(loader.name, loader)
+    module = importlib.util.module_from_spec(spec)
+    loader.exec_module(module)
+    return module
@@ -0,0 +1,117 @@
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+pytest.importorskip("telegram")
+
+USER_ID = 1001
+GROUP_ID = -2001
+
+
+def run_with_db(bot, tmp_path, body):
+    async def run():
+        bot.bad_actor_index.clear()
+        bot.bad_actor_expiry_heap.clear()
+        await bot.init_db(str(tmp_path / "search.db"))
+        try:
+            if not bot.search_index_available:
+                pytest.skip("SQLite build has no FTS5")
+            await bot.add_user(USER_ID, "searched")
+            await bot.add_group(GROUP_ID, "Searched Group")
+            return await body()
+        finally:
+            await bot.stop_db_writer()
+            await bot.close_db_pool()
+
+    return asyncio.run(run())
+
+
+async def fts_rows(bot, table):
+    return (await bot.db_fetchone(f"SELECT COUNT(*) AS n FROM {table}"))["n"]
+
+
+async def integrity_check(bot):
+    for table in ("action_log_fts", "bad_actors_fts"):
+        await bot.db_write(f"INSERT INTO {table} ({table}) VALUES ('integrity-check')")
+
+
+async def log_reasons(bot, text):
+    log_hits, _ = await bot.search_moderation_log(text)
+    return [hit["reason"] for hit in log_hits]
+
+
+async def bad_actor_reasons(bot, text):
+    _, bad_actor_hits = await bot.search_moderation_log(text)
+    return [hit["reason"] for hit in bad_actor_hits]
+
+
+def test_action_log_index_follows_insert_and_delete(bot, tmp_path):
+    async def body():
+        await bot.log_action_db(None, "warn", USER_ID, GROUP_ID, "posted crypto giveaway")
+        await bot.log_action_db(None, "warn", USER_ID, GROUP_ID, "flooded the chat")
+        assert await bot.flush_action_log() == 2
+        assert await log_reasons(bot, "giveaway") == ["posted crypto giveaway"]
+
+        await bot.db_write("DELETE FROM action_log WHERE reason = ?", ("posted crypto giveaway",))
+        assert await log_reasons(bot, "giveaway") == []
+        assert await log_reasons(bot, "flooded") == ["flooded the chat"]
+        assert await fts_rows(bot, "action_log_fts") == 1
+        await integrity_check(bot)
+
+    run_with_db(bot, tmp_path, body)
+
+
+def test_archived_action_log_rows_leave_the_index(bot, tmp_path, monkeypatch):
+    monkeypatch.setattr(bot, "ACTION_LOG_ARCHIVE_DAYS", 30)
+
+    async def body():
+        old = int(time.time()) - 60 * 86400
+        await bot.db_write(
+            "INSERT INTO action_log (action, user_id, chat_id, reason, timestamp) VALUES (?, ?, ?, ?, ?)",
+            [("ban", USER_ID, GROUP_ID, "ancient spam wave", old), ("warn", USER_ID, GROUP_ID, "recent spam", int(time.time()))],
+            many=True,
+        )
+        assert await log_reasons(bot, "spam") != []
+
+        assert await bot.archive_action_log() == 1
+        assert await log_reasons(bot, "ancient") == []
+        assert await log_reasons(bot, "spam") == ["recent spam"]
+        assert await fts_rows(bot, "action_log_fts") == 1
+        await integrity_check(bot)
+
+    run_with_db(bot, tmp_path, body)
+
+
+def test_repunished_bad_actor_leaves_no_stale_index_rows(bot, tmp_path):
+    async def body():
+        assert await bot.add_bad_actor(USER_ID, GROUP_ID, "first offence links", "mute", 3600)
+        assert await bot.add_bad_actor(USER_ID, GROUP_ID, "second offence scam", "ban")
+        assert await bad_actor_reasons(bot, "offence") == ["second offence scam"]
+        assert await bad_actor_reasons(bot, "links") == []
+        assert await fts_rows(bot, "bad_actors_fts") == 1
+
+        await bot.remove_bad_actor(USER_ID, GROUP_ID)
+        assert await fts_rows(bot, "bad_actors_fts") == 0
+        assert await fts_rows(bot, "bad_actors_fts_keys") == 0
+        assert await bad_actor_reasons(bot, "links") == []
+        assert await bad_actor_reasons(bot, "scam") == []
+        await integrity_check(bot)
+
+    run_with_db(bot, tmp_path, body)
+
+
+def test_expired_bad_actors_leave_the_index(bot, tmp_path, monkeypatch):
+    async def body():
+        assert await bot.add_bad_actor(USER_ID, GROUP_ID, "short mute for caps", "mute", 60)
+        later = time.time() + 120
+        with monkeypatch.context() as patch:
+            patch.setattr(bot.time, "time", lambda: later)
+            await bot.clean_expired_bad_actors()
+
+        assert await bad_actor_reasons(bot, "caps") == []
+        assert await fts_rows(bot, "bad_actors_fts") == 0
+        await integrity_check(bot)
+
+    run_with_db(bot, tmp_path, body)
@@ -0,0 +1,27 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+pytest.importorskip("telegram")
+
+
+def test_collects_runtime_statements(bot):
+    statements = bot.collect_sql_statements()
+    assert "SELECT user_id FROM users WHERE username = ?" in statements
+    # Migration-only SQL and f-string fragments are not collected
+    assert not any("_temp" in sql for sql in statements)
+    assert "SELECT" not in statements
+
+
+def test_query_plans_have_no_unexpected_scans(bot, tmp_path):
+    async def run():
+        await bot.init_db(str(tmp_path / "plans.db"))
+        try:
+            return await bot.check_query_plans()
+        finally:
+            await bot.stop_db_writer()
+            await bot.close_db_pool()
+
+    problems = asyncio.run(run())
+    assert problems == [], "\n".join(f"{sql}\n    -> {detail}" for sql, detail in problems)